@@ -1,18 +1,38 @@
-import json
+import asyncio
+import functools
 import os
 import re
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+import orjson
+from openai import AsyncOpenAI
+from selectolax.lexbor import LexborHTMLParser
 
 from prompts import (
+    SYSTEM_PROMPT_ANSWER_EXTRACT,
+    SYSTEM_PROMPT_FINAL,
+    SYSTEM_PROMPT_PLAN,
+    SYSTEM_PROMPT_POLICY_SUMMARY,
+    SYSTEM_PROMPT_PROFILE_PARSE,
+    SYSTEM_PROMPT_QUESTION_FILTER,
+    build_answer_extract_prompt,
     build_solar_prompt,
     build_plan_prompt,
+    build_policy_summary_prompt,
     build_question_filter_prompt,
-    build_profile_extract_prompt,
     build_profile_parse_prompt,
     format_profile_structured,
 )
-from upstage_client import call_document_parse, call_information_extract, call_solar
+from cache import cache_key, load_cached, store_cached
+from config import SOLAR_MODEL
+from upstage_client import (
+    async_solar_client,
+    call_document_parse,
+    call_information_extract,
+    call_solar,
+    call_solar_async,
+)
 
 
 # 기본 PDF 경로 (data 폴더 내) — 금융·재정·조세 정책
@@ -20,6 +40,24 @@ DEFAULT_PDF_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "financ
 MAX_POLICY_TEXT_CHARS = 20000
 # Plan 전용 정책 텍스트 길이 제한. None이면 전체 사용. 빈 응답 원인 파악 시 6000 등으로 줄여서 테스트.
 PLAN_MAX_POLICY_CHARS: Optional[int] = None
+# Solar 출력 토큰 상한: 보조 JSON 호출은 출력이 짧으므로 작게 (생성 지연·폭주 방지)
+HELPER_MAX_TOKENS = 1024
+PLAN_MAX_TOKENS = 3072
+POLICY_SUMMARY_MAX_TOKENS = 2048
+JSON_STOP_SEQUENCES = ["\n\n\n"]
+# Plan에 전달하는 정책 요약 최대 길이 (요약 실패 시에는 원문 앞부분 사용)
+POLICY_SUMMARY_MAX_CHARS = 2000
+
+# Document Parse 응답 fallback 직렬화 시 비울 키 (figure base64 등)
+_BINARY_PAYLOAD_KEYS = frozenset({"base64_encoding", "base64", "image", "figure", "data"})
+
+# 텍스트 정규화/출력 정리용 정규식 (import 시 1회 컴파일)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+_PROFILE_SEP_RE = re.compile(r"[,/]")
+_BOLD_RE = re.compile(r"\*\*([^*]*)\*\*")
+_THINK_RE = re.compile(r"<think>[\s\S]*?</think>")
+_CODEBLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
 
 
 REQUIRED_HEADERS = [
@@ -51,10 +89,13 @@ IE_SCHEMA = {
 
 
 def _clean_terminal_output(text: str) -> str:
-    """터미널 가독성: 굵은글씨(**...**) 제거."""
+    """터미널 가독성: 굵은글씨(**...**) 제거.
+
+    "**"가 없으면 정규식을 건너뛰고, 있으면 더 이상 바뀌지 않을 때까지 반복(중첩 대응).
+    """
     s = text.strip()
-    for _ in range(5):
-        prev, s = s, re.sub(r"\*\*([^*]*)\*\*", r"\1", s)
+    while "**" in s:
+        prev, s = s, _BOLD_RE.sub(r"\1", s)
         if s == prev:
             break
     return s.strip()
@@ -72,6 +113,29 @@ def _ensure_required_headers(text: str) -> str:
     return "\n".join(lines).strip()
 
 
+def _strip_binary_payloads(value: Any) -> Any:
+    """이미지 base64 등 텍스트가 아닌 대용량 값을 비운 사본 반환 (fallback 직렬화용)."""
+    if isinstance(value, dict):
+        return {
+            k: "" if k in _BINARY_PAYLOAD_KEYS else _strip_binary_payloads(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_strip_binary_payloads(v) for v in value]
+    return value
+
+
+def _element_text(content: Any) -> str:
+    """elements[].content에서 본문 텍스트 추출 (text > markdown > html 순)."""
+    if isinstance(content, dict):
+        t = content.get("text") or content.get("markdown") or content.get("html")
+    elif isinstance(content, str):
+        t = content
+    else:
+        t = None
+    return str(t).strip() if t else ""
+
+
 def _policy_text_from_parsed_doc(parsed_doc: Dict[str, Any]) -> str:
     """Document Parse 응답을 텍스트로 변환.
 
@@ -88,62 +152,167 @@ def _policy_text_from_parsed_doc(parsed_doc: Dict[str, Any]) -> str:
                 if isinstance(nested_val, str) and nested_val.strip():
                     return _normalize_policy_text(nested_val)
     # content.text가 비어 있고 elements에 본문이 있는 경우
-    elements = parsed_doc.get("elements") or parsed_doc.get("content", {}).get("elements")
+    content = parsed_doc.get("content")
+    elements = parsed_doc.get("elements") or (content.get("elements") if isinstance(content, dict) else None)
     if isinstance(elements, list):
-        parts = []
-        for el in elements:
-            if not isinstance(el, dict):
-                continue
-            cat = el.get("category") or el.get("type") or ""
-            content = el.get("content")
-            if isinstance(content, dict):
-                t = content.get("text") or content.get("markdown") or content.get("html")
-            elif isinstance(content, str):
-                t = content
-            else:
-                t = None
-            if t and str(t).strip():
-                parts.append(str(t).strip())
-        if parts:
-            return _normalize_policy_text(" ".join(parts))
+        joined = " ".join(
+            text
+            for text in (_element_text(el.get("content")) for el in elements if isinstance(el, dict))
+            if text
+        )
+        if joined:
+            return _normalize_policy_text(joined)
     try:
-        return _normalize_policy_text(json.dumps(parsed_doc, ensure_ascii=False))
+        return _normalize_policy_text(orjson.dumps(_strip_binary_payloads(parsed_doc)).decode())
     except Exception:
         return _normalize_policy_text(str(parsed_doc))
 
 
 def _normalize_policy_text(raw_text: str) -> str:
-    """HTML/잡음 제거 및 길이 제한."""
+    """HTML/잡음 제거 및 길이 제한.
+
+    HTML로 시작하는 응답은 selectolax(C 파서)로 한 번에 텍스트 추출하고,
+    파싱 실패 시 또는 본문 중간에만 태그가 있는 경우 정규식으로 태그 제거.
+    """
     text = raw_text
-    if "<" in text and ">" in text:
-        text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    parsed_html = False
+    if "<" in text[:200]:
+        try:
+            text = LexborHTMLParser(text).text(separator=" ", strip=True)
+            parsed_html = True
+        except Exception:
+            text = raw_text
+    if not parsed_html and "<" in text and ">" in text:
+        text = _HTML_TAG_RE.sub(" ", text)
+    text = _WS_RE.sub(" ", text).strip()
     return text[:MAX_POLICY_TEXT_CHARS]
 
 
-def _get_structured_profile(profile: str) -> str:
-    """
-    프로필 문자열을 구조화하여 반환. Plan/질문필터에 전달.
-    실패 시 원본 profile 반환.
-    """
+def _structured_profile_from_output(output: str) -> Optional[str]:
+    """프로필 파싱 Solar 출력을 구조화 문자열로 변환. 실패 시 None."""
     try:
-        prompt = build_profile_parse_prompt(profile=profile)
-        output = call_solar(prompt, reasoning_effort=None)
         parsed = None
         try:
-            parsed = json.loads(output)
-        except json.JSONDecodeError:
+            parsed = orjson.loads(output)
+        except orjson.JSONDecodeError:
             start = output.find("{")
             end = output.rfind("}")
             if start != -1 and end != -1 and end > start:
-                parsed = json.loads(output[start : end + 1])
+                parsed = orjson.loads(output[start : end + 1])
         if isinstance(parsed, dict) and parsed:
-            structured = format_profile_structured(parsed)
-            if structured:
-                return structured
+            return format_profile_structured(parsed) or None
     except Exception:
         pass
-    return profile.strip()
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_profile_cached(profile: str) -> str:
+    """Solar로 프로필 구조화. 성공한 결과만 캐시되도록 실패 시 예외를 던짐."""
+    prompt = build_profile_parse_prompt(profile=profile)
+    output = call_solar(
+        prompt,
+        system=SYSTEM_PROMPT_PROFILE_PARSE,
+        reasoning_effort=None,
+        max_tokens=HELPER_MAX_TOKENS,
+        stop=JSON_STOP_SEQUENCES,
+        use_semantic_cache=False,
+    )
+    structured = _structured_profile_from_output(output)
+    if structured is None:
+        raise ValueError("프로필 구조화 결과를 파싱할 수 없음")
+    return structured
+
+
+def _get_structured_profile(profile: str) -> str:
+    """
+    프로필 문자열을 구조화하여 반환. Plan/질문필터에 전달.
+    실패 시 원본 profile 반환. 같은 입력은 Solar를 다시 호출하지 않음 (실패한 입력은 재시도).
+    """
+    try:
+        return _parse_profile_cached(profile)
+    except Exception:
+        return profile.strip()
+
+
+async def _get_structured_profile_async(profile: str) -> str:
+    """_get_structured_profile의 비동기 버전 (Plan과 동시 실행용).
+
+    lru_cache는 코루틴 결과를 캐시할 수 없으므로 캐시를 쓰는 동기 함수를 스레드에서 실행.
+    """
+    return await asyncio.to_thread(_get_structured_profile, profile)
+
+
+def _extend_structured_profile(structured: str, base_profile: str, updated_profile: str) -> Optional[str]:
+    """답변으로 덧붙은 "필드: 값" 조각만 구조화 프로필에 병합.
+
+    _append_profile_field는 원본 뒤에 "/ 필드: 값"을 이어 붙이므로, 추가된 꼬리만
+    파싱하면 Solar 재호출 없이 구조화 결과를 갱신할 수 있음.
+    꼬리가 "필드: 값" 형태가 아니면 None (전체 재파싱 필요).
+    """
+    base = base_profile.strip()
+    updated = updated_profile.strip()
+    if not updated.startswith(base):
+        return None
+    parts = [structured] if structured else []
+    for fragment in updated[len(base) :].split("/"):
+        fragment = fragment.strip()
+        if not fragment:
+            continue
+        key, sep, value = fragment.partition(":")
+        if not sep or not key.strip() or not value.strip():
+            return None
+        parts.append(f"{key.strip()}: {value.strip()}")
+    return ", ".join(parts)
+
+
+def _profile_materially_changed(raw_profile: str, structured_profile: str) -> bool:
+    """구조화 결과에 원본 프로필에 없는 값이 생겼는지 판단.
+
+    원본 프로필로 먼저 돌린 Plan을 구조화 프로필로 다시 돌릴지 결정할 때 사용.
+    값이 모두 원본에 그대로 있으면 같은 정보의 재배열일 뿐이므로 재실행하지 않음.
+    """
+    raw_compact = "".join(raw_profile.split())
+    for part in structured_profile.split(","):
+        _, sep, value = part.partition(":")
+        value = "".join(value.split()) if sep else ""
+        if value and value not in raw_compact:
+            return True
+    return False
+
+
+def _normalize_field_name(name: str) -> str:
+    """필드명 비교용 정규화: 공백·밑줄 제거, 소문자."""
+    return _WS_RE.sub("", name).replace("_", "").lower()
+
+
+def _profile_field_names(profile: str) -> set:
+    """구조화 프로필("키: 값, 키: 값" 또는 "/" 구분)에서 값이 있는 키 집합 추출."""
+    names = set()
+    for part in _PROFILE_SEP_RE.split(profile):
+        key, sep, value = part.partition(":")
+        if sep and value.strip():
+            names.add(_normalize_field_name(key))
+    return names
+
+
+def _prefilter_questions(profile: str, questions: list) -> list:
+    """로컬 사전 필터: 질문의 field명이 프로필의 키와 정확히 일치하면 제외.
+
+    예: 프로필 "나이: 29세, 혼인상태: 미혼"이면 field "혼인상태" 질문 제외.
+    "월소득: 250"만 있을 때 field "소득" 질문은 키가 다르므로 남김.
+    field가 없거나 프로필 키에 없는 질문은 판단이 필요하므로 남겨 LLM 필터로 넘김.
+    """
+    profile_fields = _profile_field_names(profile)
+    if not profile_fields:
+        return list(questions)
+    remaining = []
+    for item in questions:
+        field = _normalize_field_name(str(item.get("field") or ""))
+        if field and field in profile_fields:
+            continue
+        remaining.append(item)
+    return remaining
 
 
 def _filter_questions_llm(profile: str, questions: Any) -> list:
@@ -163,19 +332,31 @@ def _filter_questions_llm(profile: str, questions: Any) -> list:
     if not normalized:
         return []
 
+    # 필드명이 프로필에 그대로 적힌 질문은 Solar 호출 없이 제외
+    ambiguous = _prefilter_questions(profile, normalized)
+    if not ambiguous:
+        return []
+
     try:
-        prompt = build_question_filter_prompt(profile=profile, questions=normalized)
-        output = call_solar(prompt, reasoning_effort=None)
+        prompt = build_question_filter_prompt(profile=profile, questions=ambiguous)
+        output = call_solar(
+            prompt,
+            system=SYSTEM_PROMPT_QUESTION_FILTER,
+            reasoning_effort=None,
+            max_tokens=HELPER_MAX_TOKENS,
+            stop=JSON_STOP_SEQUENCES,
+            use_semantic_cache=False,
+        )
 
         # JSON 배열 파싱 (앞뒤 설명 제거)
         parsed = None
         try:
-            parsed = json.loads(output)
-        except json.JSONDecodeError:
+            parsed = orjson.loads(output)
+        except orjson.JSONDecodeError:
             start = output.find("[")
             end = output.rfind("]")
             if start != -1 and end != -1 and end > start:
-                parsed = json.loads(output[start : end + 1])
+                parsed = orjson.loads(output[start : end + 1])
 
         if isinstance(parsed, list) and parsed:
             filtered = [x for x in parsed if isinstance(x, dict) and (x.get("question") or x.get("field"))]
@@ -185,7 +366,7 @@ def _filter_questions_llm(profile: str, questions: Any) -> list:
     except Exception:
         pass
 
-    return normalized
+    return ambiguous
 
 
 def _parse_plan_json(raw_text: str) -> Optional[Dict[str, Any]]:
@@ -197,42 +378,68 @@ def _parse_plan_json(raw_text: str) -> Optional[Dict[str, Any]]:
     if not raw_text or not raw_text.strip():
         return None
     text = raw_text.strip()
+    # 이미 순수 JSON인 경우(일반적인 경우) 정규식 없이 바로 파싱
+    if text.startswith("{") and text.endswith("}"):
+        try:
+            parsed = orjson.loads(text)
+            if isinstance(parsed, dict):
+                return parsed
+        except orjson.JSONDecodeError:
+            pass
     # <think>...</think> 블록 제거 (reasoning 출력)
     if "</think>" in text:
-        text = re.sub(r"<think>[\s\S]*?</think>", "", text, flags=re.DOTALL)
+        text = _THINK_RE.sub("", text)
         text = text.strip()
     # ```json ... ``` 또는 ``` ... ``` 코드블록에서 내용만 추출
-    code_block = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
-    if code_block:
-        text = code_block.group(1).strip()
+    if "```" in text:
+        code_block = _CODEBLOCK_RE.search(text)
+        if code_block:
+            text = code_block.group(1).strip()
     try:
-        parsed = json.loads(text)
+        parsed = orjson.loads(text)
         return parsed if isinstance(parsed, dict) else None
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass
     start = text.find("{")
     end = text.rfind("}")
     if start == -1 or end == -1 or end <= start:
         return None
     try:
-        parsed = json.loads(text[start : end + 1])
+        parsed = orjson.loads(text[start : end + 1])
         return parsed if isinstance(parsed, dict) else None
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return None
 
 
-def _plan_phase(profile: str, policy_text: str, ie_extract: Optional[str]) -> Dict[str, Any]:
-    """Solar Plan 단계: 조건 분석 및 질문 생성."""
-    plan_text = (
-        policy_text[:PLAN_MAX_POLICY_CHARS] if PLAN_MAX_POLICY_CHARS else policy_text
-    )
-    prompt = build_plan_prompt(profile=profile, policy_text=plan_text, ie_extract=ie_extract)
-    output = call_solar(prompt, reasoning_effort="medium", max_tokens=8192)
-    parsed = _parse_plan_json(output)
-    
-    if parsed:
-        return parsed
-    
+def _summarize_policy(policy_text: str) -> str:
+    """Plan용 정책 요약 생성. 모델·프롬프트·정책 본문 해시 기준으로 디스크 캐시.
+
+    Plan은 요약만 보고 조건·질문을 도출하고, 최종 상담에서만 원문 전체를 사용.
+    요약 실패 시 원문을 그대로 반환(Plan 프롬프트에서 길이 제한).
+    """
+    key = cache_key("policy-summary", SOLAR_MODEL, POLICY_SUMMARY_MAX_TOKENS, SYSTEM_PROMPT_POLICY_SUMMARY, policy_text)
+    cached = load_cached(key)
+    if isinstance(cached, str) and cached:
+        return cached
+    try:
+        prompt = build_policy_summary_prompt(policy_text=policy_text)
+        output = call_solar(
+            prompt,
+            system=SYSTEM_PROMPT_POLICY_SUMMARY,
+            reasoning_effort=None,
+            max_tokens=POLICY_SUMMARY_MAX_TOKENS,
+            use_semantic_cache=False,
+        )
+    except Exception:
+        return policy_text
+    summary = _clean_terminal_output(output)[:POLICY_SUMMARY_MAX_CHARS]
+    if not summary:
+        return policy_text
+    store_cached(key, summary)
+    return summary
+
+
+def _empty_plan() -> Dict[str, Any]:
     return {
         "certain_conditions": [],
         "uncertain_conditions": [],
@@ -241,15 +448,84 @@ def _plan_phase(profile: str, policy_text: str, ie_extract: Optional[str]) -> Di
     }
 
 
-def _safe_information_extract(pdf_path: str) -> Optional[str]:
-    """Information Extraction 결과를 안전하게 반환. PDF 파일 경로를 넘긴다."""
+def _plan_prompt(profile: str, policy_text: str, ie_extract: Optional[str]) -> str:
+    plan_text = (
+        policy_text[:PLAN_MAX_POLICY_CHARS] if PLAN_MAX_POLICY_CHARS else policy_text
+    )
+    return build_plan_prompt(profile=profile, policy_text=plan_text, ie_extract=ie_extract)
+
+
+def _plan_phase(profile: str, policy_text: str, ie_extract: Optional[str]) -> Dict[str, Any]:
+    """Solar Plan 단계: 조건 분석 및 질문 생성."""
+    prompt = _plan_prompt(profile, policy_text, ie_extract)
+    output = call_solar(
+        prompt,
+        system=SYSTEM_PROMPT_PLAN,
+        reasoning_effort="low",
+        max_tokens=PLAN_MAX_TOKENS,
+        cache_scope=profile,
+    )
+    return _parse_plan_json(output) or _empty_plan()
+
+
+async def _plan_phase_async(
+    client: AsyncOpenAI, profile: str, policy_text: str, ie_extract: Optional[str]
+) -> Dict[str, Any]:
+    """_plan_phase의 비동기 버전 (프로필 구조화와 동시 실행용)."""
+    prompt = _plan_prompt(profile, policy_text, ie_extract)
+    output = await call_solar_async(
+        client,
+        prompt,
+        system=SYSTEM_PROMPT_PLAN,
+        reasoning_effort="low",
+        max_tokens=PLAN_MAX_TOKENS,
+        cache_scope=profile,
+    )
+    return _parse_plan_json(output) or _empty_plan()
+
+
+async def _initial_analysis_async(
+    profile: str, policy_text: str, ie_extract: Optional[str]
+) -> Tuple[str, str, Dict[str, Any]]:
+    """프로필 구조화와 (정책 요약 → 1차 Plan)을 동시에 실행.
+
+    비동기 Solar 클라이언트는 이 함수 안에서 열어 Plan 호출들이 공유하고, 끝나면 닫음.
+
+    Plan은 원본 프로필로 먼저 돌리고, 구조화 결과가 원본에 없는 정보를 만들어낸
+    경우에만 구조화 프로필로 Plan을 다시 실행.
+
+    Returns:
+        (구조화 프로필, 정책 요약, Plan 결과)
+    """
+    async with async_solar_client() as client:
+
+        async def summarize_then_plan() -> Tuple[str, Dict[str, Any]]:
+            policy_summary = await asyncio.to_thread(_summarize_policy, policy_text)
+            plan = await _plan_phase_async(
+                client, profile=profile.strip(), policy_text=policy_summary, ie_extract=ie_extract
+            )
+            return policy_summary, plan
+
+        profile_for_prompts, (policy_summary, plan_result) = await asyncio.gather(
+            _get_structured_profile_async(profile),
+            summarize_then_plan(),
+        )
+        if _profile_materially_changed(profile, profile_for_prompts):
+            plan_result = await _plan_phase_async(
+                client, profile=profile_for_prompts, policy_text=policy_summary, ie_extract=ie_extract
+            )
+    return profile_for_prompts, policy_summary, plan_result
+
+
+def _safe_information_extract(pdf_bytes: bytes, filename: str) -> Optional[str]:
+    """Information Extraction 결과를 안전하게 반환. 이미 읽은 PDF 바이트를 넘긴다."""
     try:
-        result = call_information_extract(document_path=pdf_path, schema=IE_SCHEMA)
+        result = call_information_extract(pdf_bytes, filename, schema=IE_SCHEMA)
     except Exception:
         return None
 
     try:
-        return json.dumps(result, ensure_ascii=False)
+        return orjson.dumps(result).decode()
     except (TypeError, ValueError):
         return None
 
@@ -264,46 +540,69 @@ def _append_profile_field(profile: str, field_name: str, value: str) -> str:
     return f"{field_name}: {value}"
 
 
-def _update_profile_from_message_llm(
-    profile: str,
-    user_message: str,
-    question_text: str = "",
-    field_name: Optional[str] = None,
-) -> str:
-    """LLM 기반: 질문 맥락 + 사용자 답변으로 프로필 정보 추출 및 병합."""
-    if not user_message or not user_message.strip():
-        return profile.strip()
+def _extract_answer_fields(answers: list) -> Dict[int, Dict[str, Any]]:
+    """모든 답변의 프로필 필드를 Solar 1회 호출로 추출.
 
+    Returns:
+        {답변 번호(1부터): {필드명: 값}}. 모델이 빠뜨린 번호는 포함되지 않음
+    """
+    prompt = build_answer_extract_prompt(answers=answers)
+    output = call_solar(
+        prompt,
+        system=SYSTEM_PROMPT_ANSWER_EXTRACT,
+        reasoning_effort=None,
+        max_tokens=HELPER_MAX_TOKENS,
+        stop=JSON_STOP_SEQUENCES,
+        use_semantic_cache=False,
+    )
+
+    parsed = None
     try:
-        prompt = build_profile_extract_prompt(
-            user_message=user_message.strip(),
-            question_text=question_text or "",
-            field_name=field_name or "",
-        )
-        output = call_solar(prompt, reasoning_effort=None)
+        parsed = orjson.loads(output)
+    except orjson.JSONDecodeError:
+        start = output.find("{")
+        end = output.rfind("}")
+        if start != -1 and end != -1 and end > start:
+            parsed = orjson.loads(output[start : end + 1])
+    if not isinstance(parsed, dict):
+        return {}
 
-        parsed = None
-        try:
-            parsed = json.loads(output)
-        except json.JSONDecodeError:
-            start = output.find("{")
-            end = output.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                parsed = json.loads(output[start : end + 1])
+    extracted: Dict[int, Dict[str, Any]] = {}
+    for key, fields in parsed.items():
+        if str(key).strip().isdigit() and isinstance(fields, dict):
+            extracted[int(str(key).strip())] = fields
+    return extracted
 
-        updated = profile.strip()
-        if isinstance(parsed, dict) and parsed:
-            for fn, value in parsed.items():
-                if fn and value and isinstance(value, str):
-                    updated = _append_profile_field(updated, fn, value.strip())
-        else:
-            if field_name:
-                updated = _append_profile_field(updated, field_name, user_message.strip())
+
+def _update_profile_from_answers_llm(profile: str, answers: list) -> str:
+    """LLM 기반: 질문 맥락 + 사용자 답변들로 프로필 정보 추출 및 병합.
+
+    답변마다 Solar를 호출하지 않고 모든 답변을 한 번의 호출로 추출하며,
+    결과는 답변 번호로 매칭. 추출 결과가 없는 답변은 field 이름으로 답변 원문을 추가.
+
+    Args:
+        profile: 현재 프로필 문자열
+        answers: {"field", "question", "answer"} dict 목록
+    """
+    updated = profile.strip()
+    answers = [a for a in answers if a.get("answer")]
+    if not answers:
         return updated
+
+    try:
+        extracted = _extract_answer_fields(answers)
     except Exception:
-        if field_name:
-            return _append_profile_field(profile.strip(), field_name, user_message.strip())
-        return profile.strip()
+        extracted = {}
+
+    for i, item in enumerate(answers, 1):
+        fields = extracted.get(i)
+        if fields:
+            for fn, value in fields.items():
+                if fn and value and isinstance(value, str):
+                    updated = _append_profile_field(updated, fn, value.strip())
+        elif item.get("field"):
+            updated = _append_profile_field(updated, item["field"], item["answer"])
+    return updated
 
 
 def run(profile: str, pdf_path: Optional[str] = None) -> str:
@@ -323,19 +622,23 @@ def run(profile: str, pdf_path: Optional[str] = None) -> str:
         raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {actual_pdf_path}")
 
     print(f"\n📄 PDF 파싱 및 정보 추출 중 : {actual_pdf_path}")
+    # PDF는 한 번만 읽어 Document Parse / IE에 같은 바이트를 전달
+    with open(actual_pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+    filename = os.path.basename(actual_pdf_path)
     with ThreadPoolExecutor(max_workers=2) as executor:
-        future_parse = executor.submit(call_document_parse, actual_pdf_path)
-        future_ie = executor.submit(_safe_information_extract, actual_pdf_path)
+        future_parse = executor.submit(call_document_parse, pdf_bytes, filename)
+        future_ie = executor.submit(_safe_information_extract, pdf_bytes, filename)
         parsed_doc = future_parse.result()
         ie_extract = future_ie.result()
     policy_text = _policy_text_from_parsed_doc(parsed_doc)
     print("✅ PDF 파싱 완료\n")
 
-    profile_for_prompts = _get_structured_profile(profile)
-
-    # Plan 단계 (1차 분석: 조건 판단·질문 생성)
+    # Plan 단계 (1차 분석: 조건 판단·질문 생성) — 정책 요약 기반, 프로필 구조화와 동시 실행
     print("🔍 Plan (1차 분석): 조건 판단·질문 생성 중...")
-    plan_result = _plan_phase(profile=profile_for_prompts, policy_text=policy_text, ie_extract=ie_extract)
+    profile_for_prompts, policy_summary, plan_result = asyncio.run(
+        _initial_analysis_async(profile=profile, policy_text=policy_text, ie_extract=ie_extract)
+    )
     c, u, q, a = (
         plan_result.get("certain_conditions", []),
         plan_result.get("uncertain_conditions", []),
@@ -353,6 +656,8 @@ def run(profile: str, pdf_path: Optional[str] = None) -> str:
         print("📋 추가 정보가 필요합니다:")
         print("━" * 50)
         
+        base_profile = profile
+        answers: list = []
         for item in questions:
             if isinstance(item, dict):
                 field_name = item.get("field")
@@ -368,24 +673,23 @@ def run(profile: str, pdf_path: Optional[str] = None) -> str:
             if not answer:
                 continue
 
-            profile = _update_profile_from_message_llm(
-                profile, answer,
-                question_text=question_text or "",
-                field_name=field_name or "",
-            )
+            answers.append({"field": field_name or "", "question": question_text, "answer": answer})
             if field_name:
                 answered_fields[field_name] = answer
 
-        # 재평가
+        # 재평가 (답변 정보 추출은 모든 답변을 모아 한 번에)
         print("\n🔄 Plan 재분석 중...")
-        profile_for_prompts = _get_structured_profile(profile)
-        plan_result = _plan_phase(profile=profile_for_prompts, policy_text=policy_text, ie_extract=ie_extract)
+        profile = _update_profile_from_answers_llm(profile, answers)
+        profile_for_prompts = _extend_structured_profile(
+            profile_for_prompts, base_profile, profile
+        ) or _get_structured_profile(profile)
+        plan_result = _plan_phase(profile=profile_for_prompts, policy_text=policy_summary, ie_extract=ie_extract)
         print("✅ Plan 재분석 완료\n")
 
     # Final 단계
     print("📝 최종 상담 결과 생성 중...")
-    plan_json = json.dumps(plan_result, ensure_ascii=False)
-    answered_json = json.dumps(answered_fields, ensure_ascii=False) if answered_fields else None
+    plan_json = orjson.dumps(plan_result).decode()
+    answered_json = orjson.dumps(answered_fields).decode() if answered_fields else None
     prompt = build_solar_prompt(
         profile=profile_for_prompts,
         policy_text=policy_text,
@@ -393,7 +697,13 @@ def run(profile: str, pdf_path: Optional[str] = None) -> str:
         answered_fields=answered_json,
         ie_extract=ie_extract,
     )
-    output = call_solar(prompt, reasoning_effort="medium")
+    # 시맨틱 캐시는 프로필·답변이 정확히 같은 경우에만 재사용 (다른 사용자 결과 재사용 방지)
+    output = call_solar(
+        prompt,
+        system=SYSTEM_PROMPT_FINAL,
+        reasoning_effort="medium",
+        cache_scope=f"{profile_for_prompts}\n{answered_json or ''}",
+    )
     print("✅ 완료\n")
 
     print("━" * 50)
@@ -0,0 +1,93 @@
+"""API 응답 디스크 캐시 모듈
+
+같은 PDF를 반복 분석할 때 Document Parse / Information Extraction 호출을
+생략하기 위한 exact-match 캐시입니다.
+- 키: PDF 바이트 SHA-256 + 호출 파라미터 해시
+- 저장: CACHE_DIR/{sha}.json.gz (gzip 압축 JSON)
+- POLICY_NAVIGATOR_NO_CACHE=1 이면 비활성화
+"""
+
+import functools
+import gzip
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Callable, Optional
+
+import orjson
+
+from config import CACHE_DIR, CACHE_DISABLED
+
+
+def cache_key(*parts: Any) -> str:
+    """캐시 키 생성. bytes는 그대로, 나머지는 정렬된 JSON으로 해시."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json.gz")
+
+
+def load_cached(key: str) -> Optional[Any]:
+    """캐시 조회. 없거나 읽기 실패 시 None."""
+    if CACHE_DISABLED:
+        return None
+    try:
+        with gzip.open(_cache_path(key), "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, EOFError, ValueError, zlib.error):
+        return None
+
+
+def store_cached(key: str, value: Any) -> None:
+    """캐시 저장. 실패해도 본 흐름에는 영향 없음."""
+    if CACHE_DISABLED:
+        return
+    path = _cache_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(value))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def pdf_cached(namespace: str, params: Any = None) -> Callable:
+    """(문서 바이트, 파일명, ...) 형태 함수의 결과를 문서 내용 + 나머지 인자로 캐시하는 데코레이터.
+
+    Args:
+        namespace: API 구분자 (예: "document-parse")
+        params: 함수 내부에서 고정으로 쓰는 요청 파라미터. 바뀌면 이전 캐시를 재사용하지 않음
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(document: bytes, filename: str, *args: Any, **kwargs: Any) -> Any:
+            if CACHE_DISABLED:
+                return func(document, filename, *args, **kwargs)
+            ext = os.path.splitext(filename)[1].lower()
+            key = cache_key(namespace, params, document, ext, list(args), kwargs)
+            cached = load_cached(key)
+            if cached is not None:
+                return cached
+            result = func(document, filename, *args, **kwargs)
+            if result:
+                store_cached(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -17,3 +17,15 @@ if not UPSTAGE_BASE_URL:
     raise ValueError("UPSTAGE_BASE_URL 환경변수가 필요합니다.")
 if not SOLAR_MODEL:
     raise ValueError("SOLAR_MODEL 환경변수가 필요합니다.")
+
+# 로컬 응답 캐시 (Document Parse / Information Extraction 결과 재사용)
+CACHE_DIR = os.path.expanduser(
+    os.getenv("POLICY_NAVIGATOR_CACHE_DIR", os.path.join("~", ".cache", "policy-navigator"))
+)
+# POLICY_NAVIGATOR_NO_CACHE=1 이면 캐시를 읽지도 쓰지도 않음
+CACHE_DISABLED = os.getenv("POLICY_NAVIGATOR_NO_CACHE", "") == "1"
+
+# (선택) Solar 응답 시맨틱 캐시: 임베딩 유사도가 임계값 이상인 이전 프롬프트의 응답 재사용
+SEMANTIC_CACHE_ENABLED = os.getenv("POLICY_NAVIGATOR_SEMANTIC_CACHE", "") == "1"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("POLICY_NAVIGATOR_SEMANTIC_THRESHOLD", "0.97"))
+EMBEDDING_MODEL = os.getenv("UPSTAGE_EMBEDDING_MODEL", "embedding-query")
@@ -5,22 +5,17 @@ Solar Pro 2 Prompting Handbook의 베스트 프랙티스를 따릅니다:
 - JSON 출력: "Return ONLY the JSON object" 명시
 - 중요 제약: CRITICAL, MUST, NEVER 등 대문자 강조
 - 셀프 검증: VERIFICATION CHECKLIST 추가
+
+프롬프트 캐시(prefix caching) 재사용을 위해 정적인 Role/Instructions/Constraints/
+Format/Checklist는 SYSTEM_PROMPT_* 상수(system 메시지)로 분리하고,
+build_*_prompt는 매 호출마다 바뀌는 Context/Query(user 메시지)만 생성합니다.
 """
 
 import json
 from typing import Optional
 
 
-def build_profile_parse_prompt(profile: str) -> str:
-    """프로필 문자열을 JSON 객체로 파싱하는 프롬프트 생성.
-    
-    Args:
-        profile: 슬래시 구분 프로필 문자열 (예: "29세/수도권/중소기업/월250/미혼")
-    
-    Returns:
-        Solar에 전달할 프롬프트 문자열
-    """
-    return f"""# Role
+SYSTEM_PROMPT_PROFILE_PARSE = """# Role
 당신은 사용자 프로필 문자열을 구조화된 데이터로 변환하는 전문가입니다.
 
 # Instructions
@@ -36,15 +31,25 @@ def build_profile_parse_prompt(profile: str) -> str:
 - 추가 정보가 있으면 적절한 필드명으로 추가
 
 # Format
-{{
+{
   "나이": "29세",
   "지역": "수도권",
   "직업": "중소기업",
   "월소득": "월250",
   "혼인상태": "미혼"
-}}
+}"""
 
-# Query
+
+def build_profile_parse_prompt(profile: str) -> str:
+    """프로필 문자열을 JSON 객체로 파싱하는 프롬프트 생성.
+    
+    Args:
+        profile: 슬래시 구분 프로필 문자열 (예: "29세/수도권/중소기업/월250/미혼")
+    
+    Returns:
+        SYSTEM_PROMPT_PROFILE_PARSE와 함께 전달할 user 메시지
+    """
+    return f"""# Query
 프로필: {profile}
 
 위 프로필을 분석하여 JSON 객체로 변환하세요."""
@@ -70,25 +75,44 @@ def format_profile_structured(parsed: dict) -> str:
     return ", ".join(parts) if parts else ""
 
 
-def build_plan_prompt(profile: str, policy_text: str, ie_extract: Optional[str]) -> str:
-    """정책 분석 Plan 단계 프롬프트 생성.
-    
+SYSTEM_PROMPT_POLICY_SUMMARY = """# Role
+당신은 정부 정책 문서에서 자격 판단에 필요한 핵심만 요약하는 정책 분석 전문가입니다.
+
+# Instructions
+정책 문서의 각 정책/프로그램별로 다음 정보를 빠짐없이 bullet로 정리하세요.
+- 정책명
+- 대상 및 자격 요건 (나이, 소득, 지역, 가구, 재직/학업 상태 등 판단 기준)
+- 혜택/지원 내용 (금액, 비율, 기간 등 정량 정보 포함)
+- 신청 기간 및 방법 (문서에 있는 경우)
+
+# Constraints
+- CRITICAL: 전체 2000자 이내
+- 정책 문서에 있는 내용만 작성, 추측 금지
+- 자격 판단 기준이 되는 숫자·조건은 생략하지 말 것
+- NEVER add markdown bold (**text**) or code blocks
+
+# Format
+- [정책명] 대상: ... / 자격: ... / 혜택: ... / 신청: ..."""
+
+
+def build_policy_summary_prompt(policy_text: str) -> str:
+    """Plan 단계에 쓸 정책 요약 프롬프트 생성.
+
     Args:
-        profile: 구조화된 프로필 문자열
         policy_text: Document Parse로 추출한 정책 본문
-        ie_extract: Information Extraction 결과 (선택)
-    
+
     Returns:
-        Solar에 전달할 프롬프트 문자열
+        SYSTEM_PROMPT_POLICY_SUMMARY와 함께 전달할 user 메시지
     """
-    ie_section = ""
-    if ie_extract:
-        ie_section = f"""
-## 추출된 핵심 정보 (참고용)
-{ie_extract}
-"""
-    
-    return f"""# Role
+    return f"""# Context
+## 정책 문서
+{policy_text}
+
+# Query
+위 정책 문서를 자격 판단 중심으로 2000자 이내로 요약하세요."""
+
+
+SYSTEM_PROMPT_PLAN = """# Role
 당신은 정부 정책 문서를 분석하여 개인 맞춤형 자격 조건과 필요 질문을 도출하는 정책 분석 전문가입니다.
 
 # Instructions
@@ -116,21 +140,21 @@ def build_plan_prompt(profile: str, policy_text: str, ie_extract: Optional[str])
 # Constraints
 - CRITICAL: Return ONLY valid JSON object
 - NEVER add markdown code blocks (```json) or explanations
-- questions 배열: 각 항목은 {{"field": "필드명", "question": "질문 전문"}} 구조 필수
+- questions 배열: 각 항목은 {"field": "필드명", "question": "질문 전문"} 구조 필수
 - question 필드: 한 문장으로 짧게, 정책명/혜택 설명 포함 금지
 - 정책 본문에 근거 없는 내용 생성 금지
 - 모든 배열 필드는 반드시 존재해야 함 (빈 배열이라도 [] 표시)
 
 # Format
-{{
+{
   "certain_conditions": ["조건1: 설명", "조건2: 설명"],
   "uncertain_conditions": ["불확실 조건1: 이유"],
   "questions": [
-    {{"field": "주식거래여부", "question": "주식 거래 경험이 있나요?"}},
-    {{"field": "배당소득여부", "question": "배당소득이 있나요?"}}
+    {"field": "주식거래여부", "question": "주식 거래 경험이 있나요?"},
+    {"field": "배당소득여부", "question": "배당소득이 있나요?"}
   ],
   "action_candidates": ["정책A 신청 가능", "정책B 검토 필요"]
-}}
+}
 
 # VERIFICATION CHECKLIST
 응답 전 반드시 확인:
@@ -138,33 +162,41 @@ def build_plan_prompt(profile: str, policy_text: str, ie_extract: Optional[str])
 2. 각 question이 간결하며, 정책명/혜택 설명이 포함되지 않았는가?
 3. 연관 질문 중 선행 "아니오" 시 의미 없는 후속 질문은 제외했는가?
 4. JSON 구조가 위 Format과 정확히 일치하는가?
-5. questions 배열의 각 항목에 field와 question이 모두 있는가?
+5. questions 배열의 각 항목에 field와 question이 모두 있는가?"""
 
-# Context
-## 사용자 프로필
-{profile}
 
+def build_plan_prompt(profile: str, policy_text: str, ie_extract: Optional[str]) -> str:
+    """정책 분석 Plan 단계 프롬프트 생성.
+    
+    정책 문서는 재분석 시에도 동일하므로 프로필보다 앞에 두어 캐시 prefix를 늘림.
+    
+    Args:
+        profile: 구조화된 프로필 문자열
+        policy_text: Document Parse로 추출한 정책 본문
+        ie_extract: Information Extraction 결과 (선택)
+    
+    Returns:
+        SYSTEM_PROMPT_PLAN과 함께 전달할 user 메시지
+    """
+    ie_section = ""
+    if ie_extract:
+        ie_section = f"""
+## 추출된 핵심 정보 (참고용)
+{ie_extract}
+"""
+
+    return f"""# Context
 ## 정책 문서
 {policy_text[:8000]}
 {ie_section}
+## 사용자 프로필
+{profile}
 
 # Query
 위 프로필과 정책을 종합 분석하여 JSON을 생성하세요. 코드 블록 없이 JSON만 출력하세요."""
 
 
-def build_question_filter_prompt(profile: str, questions: list) -> str:
-    """프로필로 답할 수 있는 질문을 필터링하는 프롬프트 생성.
-    
-    Args:
-        profile: 구조화된 프로필 문자열
-        questions: 필터링할 질문 목록 (dict 배열)
-    
-    Returns:
-        Solar에 전달할 프롬프트 문자열
-    """
-    questions_json = json.dumps(questions, ensure_ascii=False, indent=2)
-    
-    return f"""# Role
+SYSTEM_PROMPT_QUESTION_FILTER = """# Role
 당신은 사용자 프로필을 분석하여 불필요한 질문을 걸러내는 전문가입니다.
 
 # Instructions
@@ -186,11 +218,24 @@ def build_question_filter_prompt(profile: str, questions: list) -> str:
 
 # Format
 [
-  {{"field": "필드명", "question": "질문"}},
-  {{"field": "필드명2", "question": "질문2"}}
-]
+  {"field": "필드명", "question": "질문"},
+  {"field": "필드명2", "question": "질문2"}
+]"""
+
+
+def build_question_filter_prompt(profile: str, questions: list) -> str:
+    """프로필로 답할 수 있는 질문을 필터링하는 프롬프트 생성.
+    
+    Args:
+        profile: 구조화된 프로필 문자열
+        questions: 필터링할 질문 목록 (dict 배열)
+    
+    Returns:
+        SYSTEM_PROMPT_QUESTION_FILTER와 함께 전달할 user 메시지
+    """
+    questions_json = json.dumps(questions, ensure_ascii=False, indent=2)
 
-# Context
+    return f"""# Context
 ## 사용자 프로필
 {profile}
 
@@ -201,28 +246,11 @@ def build_question_filter_prompt(profile: str, questions: list) -> str:
 위 프로필에 **명시적으로** 답이 적힌 질문만 제외하고, 나머지는 그대로 JSON 배열로 반환하세요. 헷갈리면 질문을 유지하세요. 코드 블록 없이 JSON 배열만 출력하세요."""
 
 
-def build_profile_extract_prompt(
-    user_message: str,
-    question_text: str = "",
-    field_name: str = "",
-) -> str:
-    """사용자 답변에서 프로필 정보를 추출하는 프롬프트 생성.
-    
-    Args:
-        user_message: 사용자가 입력한 답변
-        question_text: 물었던 질문 전문
-        field_name: 질문이 매핑되는 필드명 (선택)
-    
-    Returns:
-        Solar에 전달할 프롬프트 문자열
-    """
-    field_hint = f"\n필드명 힌트: {field_name}" if field_name else ""
-    
-    return f"""# Role
+SYSTEM_PROMPT_ANSWER_EXTRACT = """# Role
 당신은 사용자 답변에서 프로필 정보를 추출하는 전문가입니다.
 
 # Instructions
-질문과 사용자 답변을 분석하여 프로필에 추가할 필드명과 값을 JSON으로 반환하세요.
+질문과 사용자 답변 목록을 분석하여, 답변 번호별로 프로필에 추가할 필드명과 값을 JSON으로 반환하세요.
 
 ## 추출 원칙
 - 답변에서 명확히 확인된 정보만 추출
@@ -232,59 +260,43 @@ def build_profile_extract_prompt(
 # Constraints
 - Return ONLY valid JSON object
 - NEVER add explanations or markdown
-- 키: 필드명 (한국어)
-- 값: 문자열
-- 답변에서 추출할 정보가 없으면 빈 객체 {{}} 반환
+- 키: 답변 번호 문자열 ("1", "2", ...)
+- 값: {필드명: 값} 객체 (값은 문자열)
+- 추출할 정보가 없는 답변은 빈 객체 {}
 
 # Format
-{{
-  "필드명1": "값1",
-  "필드명2": "값2"
-}}
-
-# Context
-질문: {question_text}{field_hint}
-
-사용자 답변: {user_message}
-
-# Query
-위 답변에서 프로필 필드를 추출하여 JSON으로 반환하세요. 코드 블록 없이 JSON만 출력하세요."""
+{
+  "1": {"자녀수": "2명"},
+  "2": {}
+}"""
 
 
-def build_solar_prompt(
-    profile: str,
-    policy_text: str,
-    agent_plan: str,
-    answered_fields: Optional[str],
-    ie_extract: Optional[str],
-) -> str:
-    """최종 상담 결과 생성 프롬프트.
+def build_answer_extract_prompt(answers: list) -> str:
+    """여러 답변에서 프로필 정보를 한 번에 추출하는 프롬프트 생성.
     
     Args:
-        profile: 구조화된 프로필 문자열
-        policy_text: 정책 본문
-        agent_plan: Plan 단계 결과 JSON 문자열
-        answered_fields: 사용자가 답한 필드 JSON 문자열 (선택)
-        ie_extract: Information Extraction 결과 (선택)
+        answers: {"field", "question", "answer"} dict 목록. 1부터 번호를 매겨 전달
     
     Returns:
-        Solar에 전달할 프롬프트 문자열
+        SYSTEM_PROMPT_ANSWER_EXTRACT와 함께 전달할 user 메시지
     """
-    answered_section = ""
-    if answered_fields:
-        answered_section = f"""
-## 추가 확인된 정보
-{answered_fields}
-"""
-    
-    ie_section = ""
-    if ie_extract:
-        ie_section = f"""
-## 추출된 핵심 정보 (참고용)
-{ie_extract}
-"""
-    
-    return f"""# Role
+    answer_lines = []
+    for i, item in enumerate(answers, 1):
+        field_hint = f"\n   필드명 힌트: {item['field']}" if item.get("field") else ""
+        answer_lines.append(
+            f"{i}. 질문: {item.get('question', '')}{field_hint}\n   사용자 답변: {item['answer']}"
+        )
+    answers_text = "\n".join(answer_lines)
+
+    return f"""# Context
+## 답변 목록
+{answers_text}
+
+# Query
+위 답변마다 프로필 필드를 추출하여 답변 번호를 키로 하는 JSON으로 반환하세요. 코드 블록 없이 JSON만 출력하세요."""
+
+
+SYSTEM_PROMPT_FINAL = """# Role
 당신은 정부 정책을 개인 맞춤형 행동 가이드로 변환하는 정책 상담 전문가입니다.
 
 # Instructions
@@ -328,9 +340,48 @@ def build_solar_prompt(
 4. [다음 단계] 섹션이 있는가?
 5. [확인 필요 사항] 섹션이 있는가?
 6. 각 섹션에 구체적인 내용이 포함되어 있는가?
-7. 정책 본문에 근거한 내용인가?
+7. 정책 본문에 근거한 내용인가?"""
+
+
+def build_solar_prompt(
+    profile: str,
+    policy_text: str,
+    agent_plan: str,
+    answered_fields: Optional[str],
+    ie_extract: Optional[str],
+) -> str:
+    """최종 상담 결과 생성 프롬프트.
+    
+    정책 문서를 앞에, 사용자별 정보(프로필/답변/Agent 분석)를 뒤에 배치.
+    
+    Args:
+        profile: 구조화된 프로필 문자열
+        policy_text: 정책 본문
+        agent_plan: Plan 단계 결과 JSON 문자열
+        answered_fields: 사용자가 답한 필드 JSON 문자열 (선택)
+        ie_extract: Information Extraction 결과 (선택)
+    
+    Returns:
+        SYSTEM_PROMPT_FINAL과 함께 전달할 user 메시지
+    """
+    answered_section = ""
+    if answered_fields:
+        answered_section = f"""
+## 추가 확인된 정보
+{answered_fields}
+"""
+
+    ie_section = ""
+    if ie_extract:
+        ie_section = f"""
+## 추출된 핵심 정보 (참고용)
+{ie_extract}
+"""
 
-# Context
+    return f"""# Context
+## 정책 문서
+{policy_text}
+{ie_section}
 ## 사용자 프로필
 {profile}
 {answered_section}
@@ -338,9 +389,5 @@ def build_solar_prompt(
 ## Agent 분석 결과
 {agent_plan}
 
-## 정책 문서
-{policy_text}
-{ie_section}
-
 # Query
 위 정보를 종합하여 최종 상담 결과를 생성하세요. 5개 필수 섹션을 모두 포함하고, 구체적이고 실행 가능한 안내를 제공하세요."""
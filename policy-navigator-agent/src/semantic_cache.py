@@ -0,0 +1,144 @@
+"""Solar 응답 시맨틱 캐시 모듈
+
+프롬프트 임베딩의 코사인 유사도가 임계값 이상이면 이전 응답을 재사용합니다.
+- 네임스페이스: (모델, reasoning_effort, temperature) 등 호출 설정 + 사용자 프로필(cache_scope)별로 분리
+- 저장: CACHE_DIR/semantic_cache.jsonl.gz (항목당 한 줄씩 덧붙이는 append-only 로그)
+- 규모가 작은 로컬 CLI 용도라 인덱스 없이 선형 탐색
+- 짧은 구조화 프롬프트(프로필 파싱 등)는 값만 달라도 유사도가 높으므로
+  호출하는 쪽에서 시맨틱 캐시를 쓰지 않도록 함 (call_solar의 use_semantic_cache)
+"""
+
+import gzip
+import math
+import os
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+import orjson
+
+from config import CACHE_DIR, CACHE_DISABLED, SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_THRESHOLD
+
+
+# 네임스페이스별 최대 보관 개수 (초과 시 오래된 항목부터 제거)
+MAX_ENTRIES_PER_NAMESPACE = 512
+# 한 줄씩 덧붙이는 쓰기이므로 압축률보다 속도 우선
+COMPRESS_LEVEL = 1
+
+
+def _normalize(vector: List[float]) -> Optional[List[float]]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return None
+    return [x / norm for x in vector]
+
+
+class SemanticCache:
+    """임베딩 기반 응답 캐시.
+
+    항목은 메모리에 두고, 파일에는 insert마다 해당 항목 한 줄만 덧붙임.
+    최초 로드 시 보관 한도를 넘은 오래된 줄이나 손상된 부분이 있으면 한 번만 압축(재작성).
+    """
+
+    def __init__(self, path: str, threshold: float = SEMANTIC_CACHE_THRESHOLD) -> None:
+        self.path = path
+        self.threshold = threshold
+        self._entries: Optional[Dict[str, List[dict]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, List[dict]]:
+        if self._entries is not None:
+            return self._entries
+        entries: Dict[str, List[dict]] = {}
+        total_lines = 0
+        corrupted = False
+        try:
+            with gzip.open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        corrupted = True
+                        continue
+                    if not isinstance(record, dict) or not isinstance(record.get("namespace"), str):
+                        continue
+                    total_lines += 1
+                    entries.setdefault(record["namespace"], []).append(record)
+        except FileNotFoundError:
+            pass
+        except (OSError, EOFError, zlib.error):
+            # 동시 실행으로 덧붙이기가 섞이는 등 손상된 경우: 마지막 정상 항목까지만 사용
+            corrupted = True
+        for namespace, items in entries.items():
+            if len(items) > MAX_ENTRIES_PER_NAMESPACE:
+                entries[namespace] = items[-MAX_ENTRIES_PER_NAMESPACE:]
+        self._entries = entries
+        if corrupted or total_lines > sum(len(items) for items in entries.values()):
+            self._compact()
+        return entries
+
+    def _compact(self) -> None:
+        """보관 한도 내 정상 항목만 남기도록 파일 재작성 (로드 시 한 번)."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with gzip.open(tmp_path, "wb", compresslevel=COMPRESS_LEVEL) as f:
+                for items in (self._entries or {}).values():
+                    for record in items:
+                        f.write(orjson.dumps(record) + b"\n")
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _append(self, record: dict) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # gzip은 멤버를 이어 붙여도 하나의 스트림으로 읽힘
+            with gzip.open(self.path, "ab", compresslevel=COMPRESS_LEVEL) as f:
+                f.write(orjson.dumps(record) + b"\n")
+        except (OSError, TypeError):
+            pass
+
+    def lookup(self, namespace: str, embedding: List[float]) -> Optional[str]:
+        """가장 유사한 항목의 응답 반환. 임계값 미만이면 None."""
+        query = _normalize(embedding)
+        if query is None:
+            return None
+        with self._lock:
+            entries = self._load().get(namespace, [])
+            best_score, best_response = -1.0, None
+            for entry in entries:
+                vec = entry.get("embedding")
+                if not isinstance(vec, list) or len(vec) != len(query):
+                    continue
+                score = sum(a * b for a, b in zip(query, vec))
+                if score > best_score:
+                    best_score, best_response = score, entry.get("response")
+        if best_score >= self.threshold and isinstance(best_response, str):
+            return best_response
+        return None
+
+    def insert(self, namespace: str, embedding: List[float], response: str) -> None:
+        """응답 저장. 빈 응답은 저장하지 않음."""
+        vec = _normalize(embedding)
+        if vec is None or not response:
+            return
+        record = {"namespace": namespace, "embedding": vec, "response": response}
+        with self._lock:
+            entries = self._load().setdefault(namespace, [])
+            entries.append(record)
+            if len(entries) > MAX_ENTRIES_PER_NAMESPACE:
+                del entries[: len(entries) - MAX_ENTRIES_PER_NAMESPACE]
+            self._append(record)
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """설정상 활성화된 경우에만 캐시 인스턴스 반환."""
+    if CACHE_DISABLED or not SEMANTIC_CACHE_ENABLED:
+        return None
+    return _SEMANTIC_CACHE
+
+
+_SEMANTIC_CACHE = SemanticCache(os.path.join(CACHE_DIR, "semantic_cache.jsonl.gz"))
@@ -1,13 +1,40 @@
+import asyncio
 import base64
-import json
+import functools
+import hashlib
+import io
+import time
+from typing import Any, List, Optional
+
+import httpx
+import orjson
 import requests
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 
-from config import SOLAR_MODEL, UPSTAGE_API_KEY, UPSTAGE_BASE_URL
+from cache import pdf_cached
+from config import EMBEDDING_MODEL, SOLAR_MODEL, UPSTAGE_API_KEY, UPSTAGE_BASE_URL
+from semantic_cache import get_semantic_cache
 
 
 DOCUMENT_PARSE_PATH = "/document-digitization"
 INFORMATION_EXTRACT_PATH = "/information-extraction"
+INFORMATION_EXTRACT_MODEL = "information-extract"
+# 임베딩 API 입력 길이 제한 대응 (프롬프트 뒷부분만 임베딩).
+# 이 구간은 정책 요약 등 공유 내용이 대부분이므로, 사용자별 정보는 cache_scope로 정확히 구분
+EMBEDDING_MAX_CHARS = 4000
+
+# 정책 텍스트(html)만 사용하므로 figure base64·좌표는 요청하지 않음 (응답 크기·처리 시간 절감)
+# chart_recognition은 차트 속 수치를 표 텍스트로 얻기 위해 유지
+DOCUMENT_PARSE_PARAMS = {
+    "model": "document-parse-nightly",
+    "mode": "auto",
+    "ocr": "auto",
+    "chart_recognition": True,
+    "output_formats": '["html"]',
+}
 
 
 def _ensure_v1(base_url: str) -> str:
@@ -19,54 +46,216 @@ def _ensure_v1(base_url: str) -> str:
 VERSIONED_BASE_URL = _ensure_v1(UPSTAGE_BASE_URL)
 SOLAR_BASE_URL = VERSIONED_BASE_URL
 
+# 모듈 단위로 재사용하는 클라이언트: 호출마다 TCP/TLS 연결을 새로 맺지 않도록 커넥션 풀 유지
+# 연결(connect)은 짧게, 응답 대기(read)는 길게. 일시 오류(연결 실패/429/5xx)는 지수 백오프로 재시도
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 120
+# Solar 생성(특히 reasoning)은 오래 걸릴 수 있어 SDK 기본값(600초) 유지
+SOLAR_READ_TIMEOUT = 600
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+# 재시도 대기 상한(초): Retry-After가 이보다 길면 무시하고 지수 백오프 사용
+MAX_RETRY_DELAY = 30
+# 429(요청 한도 초과)도 잠시 뒤 다시 시도하면 성공하는 일시 오류로 취급
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
-def call_solar(
-    prompt: str,
-    *,
-    temperature: float = 0.2,
-    max_tokens: int = 16384,
-    reasoning_effort: str | None = None,
-) -> str:
-    """Solar 모델을 호출하여 응답을 반환.
+# OpenAI SDK는 연결 오류·429·5xx를 max_retries만큼 지수 백오프로 자동 재시도
+_SOLAR_TIMEOUT = httpx.Timeout(SOLAR_READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+_SOLAR_CLIENT = OpenAI(
+    api_key=UPSTAGE_API_KEY, base_url=SOLAR_BASE_URL, timeout=_SOLAR_TIMEOUT, max_retries=MAX_RETRIES
+)
+_IE_CLIENT = OpenAI(
+    api_key=UPSTAGE_API_KEY,
+    base_url=f"{VERSIONED_BASE_URL}{INFORMATION_EXTRACT_PATH}",
+    timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+    max_retries=MAX_RETRIES,
+)
+_HTTP_SESSION = requests.Session()
+# 연결 단계 실패만 어댑터에서 재시도 (본문 전송 전이라 스트리밍 업로드와 무관).
+# 5xx 재시도는 multipart 스트림을 새로 만들어야 하므로 call_document_parse에서 처리
+_HTTP_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            connect=MAX_RETRIES,
+            read=0,
+            status=0,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+        ),
+    ),
+)
 
-    reasoning_effort: Solar Pro 2는 기본 꺼짐, "high"로 활성화.
-                      Solar Pro 3는 high(60%)/medium(30%)/low(꺼짐).
+
+def async_solar_client() -> AsyncOpenAI:
+    """call_solar_async용 비동기 클라이언트 생성.
+
+    AsyncOpenAI 커넥션 풀은 이벤트 루프에 묶이므로, 호출하는 쪽에서
+    `async with async_solar_client() as client:`로 루프 안에서 열고 닫는다.
     """
-    client = OpenAI(
-        api_key=UPSTAGE_API_KEY,
-        base_url=SOLAR_BASE_URL,
+    return AsyncOpenAI(
+        api_key=UPSTAGE_API_KEY, base_url=SOLAR_BASE_URL, timeout=_SOLAR_TIMEOUT, max_retries=MAX_RETRIES
     )
+
+
+def _embed(text: str) -> Optional[List[float]]:
+    """시맨틱 캐시용 임베딩. 실패 시 None (캐시 없이 진행)."""
+    try:
+        response = _SOLAR_CLIENT.embeddings.create(model=EMBEDDING_MODEL, input=text[-EMBEDDING_MAX_CHARS:])
+        return list(response.data[0].embedding)
+    except Exception:
+        return None
+
+
+def _solar_namespace(
+    system: Optional[str],
+    temperature: float,
+    reasoning_effort: Optional[str],
+    cache_scope: Optional[str] = None,
+) -> str:
+    """시맨틱 캐시 네임스페이스: 호출 설정이나 cache_scope가 다른 응답끼리 섞이지 않도록 분리."""
+    system_hash = hashlib.sha256(system.encode("utf-8")).hexdigest()[:16] if system else ""
+    scope_hash = hashlib.sha256(cache_scope.encode("utf-8")).hexdigest()[:16] if cache_scope else ""
+    return f"{SOLAR_MODEL}|{reasoning_effort}|{temperature}|{system_hash}|{scope_hash}"
+
+
+def _solar_request_kwargs(
+    prompt: str,
+    system: Optional[str],
+    temperature: float,
+    max_tokens: int,
+    reasoning_effort: Optional[str],
+    stop: Optional[List[str]] = None,
+) -> dict:
+    """chat.completions.create 인자 구성 (동기/비동기 공용)."""
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
     kwargs: dict = {
         "model": SOLAR_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
+        "messages": messages,
         "temperature": temperature,
         "max_tokens": max_tokens,
         "stream": False,
     }
     if reasoning_effort is not None:
         kwargs["reasoning_effort"] = reasoning_effort
-    response = client.chat.completions.create(**kwargs)
+    if stop:
+        kwargs["stop"] = stop
+    return kwargs
+
+
+def _solar_content(response: Any) -> Optional[str]:
     choice = response.choices[0] if response.choices else None
-    content = choice.message.content if choice and choice.message else None
+    return choice.message.content if choice and choice.message else None
+
+
+def call_solar(
+    prompt: str,
+    *,
+    system: Optional[str] = None,
+    temperature: float = 0.2,
+    max_tokens: int = 16384,
+    reasoning_effort: str | None = None,
+    stop: Optional[List[str]] = None,
+    use_semantic_cache: bool = True,
+    cache_scope: Optional[str] = None,
+) -> str:
+    """Solar 모델을 호출하여 응답을 반환.
+
+    system: 정적 지시문(SYSTEM_PROMPT_*). system 메시지로 앞에 고정해
+            provider 측 prompt cache가 prefix 전체를 재사용하도록 함.
+    reasoning_effort: Solar Pro 2는 기본 꺼짐, "high"로 활성화.
+                      Solar Pro 3는 high(60%)/medium(30%)/low(꺼짐).
+    stop: 생성 중단 시퀀스 (짧은 JSON 출력의 불필요한 이어쓰기 방지).
+    use_semantic_cache: False면 시맨틱 캐시를 건너뜀. 값 하나만 달라도 유사도가
+                        높게 나오는 짧은 구조화 프롬프트에 사용.
+    cache_scope: 시맨틱 캐시에서 정확히 일치해야 하는 부분 (예: 사용자 프로필).
+                 유사도와 무관하게 scope가 다르면 다른 사용자의 응답을 재사용하지 않음.
+
+    시맨틱 캐시가 켜져 있으면 유사 프롬프트의 이전 응답을 먼저 조회.
+    """
+    semantic_cache = get_semantic_cache() if use_semantic_cache else None
+    namespace = _solar_namespace(system, temperature, reasoning_effort, cache_scope)
+    embedding = _embed(prompt) if semantic_cache else None
+    if semantic_cache and embedding:
+        cached = semantic_cache.lookup(namespace, embedding)
+        if cached is not None:
+            return cached
+
+    kwargs = _solar_request_kwargs(prompt, system, temperature, max_tokens, reasoning_effort, stop)
+    response = _SOLAR_CLIENT.chat.completions.create(**kwargs)
+    content = _solar_content(response)
+    if semantic_cache and embedding and content:
+        semantic_cache.insert(namespace, embedding, content)
+    return content if content is not None else ""
+
+
+async def call_solar_async(
+    client: AsyncOpenAI,
+    prompt: str,
+    *,
+    system: Optional[str] = None,
+    temperature: float = 0.2,
+    max_tokens: int = 16384,
+    reasoning_effort: str | None = None,
+    stop: Optional[List[str]] = None,
+    use_semantic_cache: bool = True,
+    cache_scope: Optional[str] = None,
+) -> str:
+    """call_solar의 비동기 버전. 서로 독립적인 Solar 호출을 asyncio.gather로 겹칠 때 사용.
+
+    client는 async_solar_client()로 연 클라이언트 (같은 이벤트 루프 안에서 재사용).
+
+    시맨틱 캐시(임베딩 호출·파일 I/O)는 이벤트 루프를 막지 않도록 스레드에서 처리.
+    """
+    semantic_cache = get_semantic_cache() if use_semantic_cache else None
+    namespace = _solar_namespace(system, temperature, reasoning_effort, cache_scope)
+    embedding = await asyncio.to_thread(_embed, prompt) if semantic_cache else None
+    if semantic_cache and embedding:
+        cached = await asyncio.to_thread(semantic_cache.lookup, namespace, embedding)
+        if cached is not None:
+            return cached
+
+    kwargs = _solar_request_kwargs(prompt, system, temperature, max_tokens, reasoning_effort, stop)
+    response = await client.chat.completions.create(**kwargs)
+    content = _solar_content(response)
+    if semantic_cache and embedding and content:
+        await asyncio.to_thread(semantic_cache.insert, namespace, embedding, content)
     return content if content is not None else ""
 
 
-def call_document_parse(pdf_path: str) -> dict:
-    """Document Parse API를 호출하여 PDF를 파싱."""
+@pdf_cached("document-parse", params=DOCUMENT_PARSE_PARAMS)
+def call_document_parse(pdf_bytes: bytes, filename: str) -> dict:
+    """Document Parse API를 호출하여 PDF를 파싱. 같은 PDF는 디스크 캐시 결과 반환.
+
+    Args:
+        pdf_bytes: PDF 파일 내용 (IE 호출과 공유하도록 한 번만 읽어 전달)
+        filename: 업로드 파일명
+    """
     url = f"{VERSIONED_BASE_URL}{DOCUMENT_PARSE_PATH}"
-    headers = {"Authorization": f"Bearer {UPSTAGE_API_KEY}"}
-    data = {
-        "model": "document-parse-nightly",
-        "mode": "auto",
-        "ocr": "auto",
-        "chart_recognition": True,
-        "coordinates": True,
-        "output_formats": '["html"]',
-        "base64_encoding": '["figure"]',
-    }
-    with open(pdf_path, "rb") as file_handle:
-        files = {"document": file_handle}
-        response = requests.post(url, headers=headers, files=files, data=data, timeout=120)
+    for attempt in range(MAX_RETRIES + 1):
+        # multipart 본문을 메모리에 한 번 더 만들지 않고 PDF 바이트에서 바로 스트리밍 업로드.
+        # 스트림은 한 번 읽으면 소진되므로 시도마다 새로 생성
+        encoder = MultipartEncoder(
+            fields={
+                **{key: str(value) for key, value in DOCUMENT_PARSE_PARAMS.items()},
+                "document": (filename, io.BytesIO(pdf_bytes), "application/pdf"),
+            }
+        )
+        headers = {"Authorization": f"Bearer {UPSTAGE_API_KEY}", "Content-Type": encoder.content_type}
+        response = _HTTP_SESSION.post(
+            url, headers=headers, data=encoder, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+        if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+            break
+        # 429 응답의 Retry-After(초)가 상한 이내면 우선 사용
+        retry_after = response.headers.get("Retry-After", "")
+        delay = RETRY_BACKOFF_FACTOR * (2**attempt)
+        if retry_after.isdigit() and int(retry_after) <= MAX_RETRY_DELAY:
+            delay = float(retry_after)
+        time.sleep(delay)
     if not response.ok:
         msg = f"Document Parse API 오류 ({response.status_code}). "
         if response.status_code == 500:
@@ -79,21 +268,28 @@ def call_document_parse(pdf_path: str) -> dict:
     return response.json()
 
 
-def call_information_extract(document_path: str, schema: dict) -> dict:
-    """Information Extraction API 호출. 문서(PDF/이미지)를 base64로 전달."""
-    with open(document_path, "rb") as f:
-        raw = f.read()
-    b64 = base64.standard_b64encode(raw).decode("ascii")
+@functools.lru_cache(maxsize=4)
+def _document_to_data_url(document_bytes: bytes, mime: str) -> str:
+    """문서를 base64 data URL로 변환. 같은 bytes 객체는 인코딩을 재사용.
+
+    bytes는 해시값을 객체에 캐시하므로 동일 객체 재조회 비용은 작음.
+    """
+    b64 = base64.standard_b64encode(document_bytes).decode("ascii")
+    return f"data:{mime};base64,{b64}"
+
+
+@pdf_cached("information-extract", params=INFORMATION_EXTRACT_MODEL)
+def call_information_extract(document_bytes: bytes, filename: str, schema: dict) -> dict:
+    """Information Extraction API 호출. 문서(PDF/이미지)를 base64로 전달.
+
+    같은 문서·스키마 조합은 디스크 캐시 결과 반환.
+    """
     # Upstage IE API는 문서를 image_url 형태의 base64로 받음 (PDF는 application/pdf)
-    mime = "application/pdf" if document_path.lower().endswith(".pdf") else "image/png"
-    data_url = f"data:{mime};base64,{b64}"
+    mime = "application/pdf" if filename.lower().endswith(".pdf") else "image/png"
+    data_url = _document_to_data_url(document_bytes, mime)
 
-    client = OpenAI(
-        api_key=UPSTAGE_API_KEY,
-        base_url=f"{VERSIONED_BASE_URL}{INFORMATION_EXTRACT_PATH}",
-    )
-    response = client.chat.completions.create(
-        model="information-extract",
+    response = _IE_CLIENT.chat.completions.create(
+        model=INFORMATION_EXTRACT_MODEL,
         messages=[
             {
                 "role": "user",
@@ -109,10 +305,9 @@ def call_information_extract(document_path: str, schema: dict) -> dict:
                 "schema": schema,
             },
         },
-        timeout=120,
     )
     content = response.choices[0].message.content
     try:
-        return json.loads(content) if isinstance(content, str) else content
-    except json.JSONDecodeError:
+        return orjson.loads(content) if isinstance(content, str) else content
+    except orjson.JSONDecodeError:
         return {}